@@ -8,7 +8,8 @@ from utils import (
     create_slideshow_video, 
     get_desktop_path,
     create_zip_file,
-    create_zip_buffer
+    create_zip_buffer,
+    extract_dates
 )
 
 def main():
@@ -83,50 +84,48 @@ def process_folder_organization(uploaded_files):
     
     with st.spinner("📁 날짜별 폴더로 정리 중..."):
         try:
-            # 임시 디렉토리에 폴더 생성 (클라우드 환경 호환)
-            with tempfile.TemporaryDirectory() as temp_dir:
-                output_base = os.path.join(temp_dir, "유치원_사진_정리")
-                os.makedirs(output_base, exist_ok=True)
+            # 촬영 날짜 추출 (진행 표시와 오류 처리 안에서 실행)
+            dates = extract_dates(tuple(file.getvalue() for file in uploaded_files))
+            
+            # 사진들을 주차별로 정리 (ZIP으로만 내려주므로 디스크에는 쓰지 않음)
+            result_folders = organize_photos_by_week(uploaded_files, dates=dates)
+            
+            if result_folders:
+                st.success("✅ 사진 정리가 완료되었습니다!")
                 
-                # 사진들을 주차별로 정리
-                result_folders = organize_photos_by_week(uploaded_files, output_base)
+                # 결과 표시
+                st.markdown("#### 📂 생성된 폴더 구조")
                 
-                if result_folders:
-                    st.success("✅ 사진 정리가 완료되었습니다!")
-                    
-                    # 결과 표시
-                    st.markdown("#### 📂 생성된 폴더 구조")
-                    
-                    for folder_name, files in result_folders.items():
-                        with st.expander(f"📁 {folder_name} ({len(files)}개 파일)"):
-                            for file in files:
-                                st.write(f"• {file}")
-                    
-                    # 폴더 정보 표시
-                    st.info(f"📍 폴더가 생성되었습니다. 아래 ZIP 파일을 다운로드하여 확인하세요.")
-                    
-                    # ZIP 파일 생성
-                    zip_buffer = create_zip_buffer(output_base)
-                    
-                    # ZIP 파일 다운로드 제공
-                    st.download_button(
-                        label="📦 ZIP 파일로 다운로드",
-                        data=zip_buffer.getvalue(),
-                        file_name="유치원_사진_정리.zip",
-                        mime="application/zip",
-                        help="다운로드한 ZIP 파일을 압축 해제하면 주차별로 정리된 폴더들을 볼 수 있습니다."
-                    )
-                    
-                    # 폴더 구조 미리보기
-                    st.markdown("#### 📋 폴더 구조 미리보기")
-                    st.code(f"""
+                for folder_name, files in result_folders.items():
+                    with st.expander(f"📁 {folder_name} ({len(files)}개 파일)"):
+                        for file_name, _ in files:
+                            st.write(f"• {file_name}")
+                
+                # 폴더 정보 표시
+                st.info(f"📍 주차별 폴더로 정리되었습니다. 아래 ZIP 파일을 다운로드하여 확인하세요.")
+                
+                # ZIP 파일 생성 (정리된 바이트에서 바로 압축)
+                zip_buffer = create_zip_buffer(result_folders)
+                
+                # ZIP 파일 다운로드 제공
+                st.download_button(
+                    label="📦 ZIP 파일로 다운로드",
+                    data=zip_buffer,
+                    file_name="유치원_사진_정리.zip",
+                    mime="application/zip",
+                    help="다운로드한 ZIP 파일을 압축 해제하면 주차별로 정리된 폴더들을 볼 수 있습니다."
+                )
+                
+                # 폴더 구조 미리보기
+                st.markdown("#### 📋 폴더 구조 미리보기")
+                st.code(f"""
 유치원_사진_정리/
 {chr(10).join([f"├── {folder}/ ({len(files)}개 파일)" for folder, files in result_folders.items()])}
-                    """)
-                    
-                else:
-                    st.error("❌ 처리할 이미지 파일이 없습니다.")
+                """)
                 
+            else:
+                st.error("❌ 처리할 이미지 파일이 없습니다.")
+            
         except Exception as e:
             st.error(f"❌ 처리 중 오류가 발생했습니다: {str(e)}")
             st.error(f"상세 오류: {type(e).__name__}")
@@ -136,10 +135,13 @@ def process_video_creation(uploaded_files):
     
     with st.spinner("🎬 슬라이드쇼 비디오 생성 중... (시간이 좀 걸릴 수 있습니다)"):
         try:
+            # 촬영 날짜 추출 (진행 표시와 오류 처리 안에서 실행)
+            dates = extract_dates(tuple(file.getvalue() for file in uploaded_files))
+            
             # 임시 디렉토리에서 비디오 생성 (클라우드 환경 호환)
             with tempfile.TemporaryDirectory() as temp_dir:
                 # 비디오 생성
-                video_path, message = create_slideshow_video(uploaded_files, temp_dir)
+                video_path, message = create_slideshow_video(uploaded_files, temp_dir, dates=dates)
                 
                 if video_path and os.path.exists(video_path):
                     st.success("✅ 슬라이드쇼 비디오가 생성되었습니다!")
@@ -156,21 +158,20 @@ def process_video_creation(uploaded_files):
                     - 아래 버튼으로 다운로드하세요.
                     """)
                     
-                    # 비디오 파일 다운로드 제공
+                    # 비디오 파일 다운로드 제공 (파일 객체를 그대로 넘겨 bytes 사본을 만들지 않음)
                     with open(video_path, "rb") as video_file:
-                        video_data = video_file.read()
                         st.download_button(
                             label="🎬 비디오 파일 다운로드",
-                            data=video_data,
+                            data=video_file,
                             file_name=video_name,
-                            mime="video/quicktime",
-                            help="생성된 MOV 파일을 다운로드합니다."
+                            mime="video/mp4",
+                            help="생성된 MP4 파일을 다운로드합니다."
                         )
                     
                     # 미리보기 (브라우저에서 지원하는 경우)
                     try:
                         st.markdown("#### 🎥 미리보기")
-                        st.video(video_data)
+                        st.video(video_path)
                     except Exception:
                         st.info("💡 비디오 미리보기는 브라우저에서 지원하지 않을 수 있습니다. 다운로드하여 확인해주세요.")
                         
@@ -197,12 +198,12 @@ def add_sidebar():
     ### 🎬 슬라이드쇼 비디오
     - 날짜순으로 자동 정렬
     - 한 장당 2초 재생
-    - MOV 형식으로 저장
+    - MP4(H.264) 형식으로 저장
     - 직접 다운로드 가능
     
     ### 💾 다운로드 방법
     - 처리 완료 후 다운로드 버튼 클릭
-    - ZIP 파일 또는 MOV 파일로 저장
+    - ZIP 파일 또는 MP4 파일로 저장
     """)
     
     st.sidebar.markdown("---")
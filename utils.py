@@ -1,44 +1,102 @@
 import os
-import cv2
 import zipfile
 from datetime import datetime, timedelta
 from pathlib import Path
+import exifread
 from PIL import Image
-from PIL.ExifTags import TAGS
-import shutil
-import tempfile
-import streamlit as st
 import io
+import logging
+import subprocess
+import platform
+import functools
+import queue
+import threading
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 
-def get_image_date(image_path):
+# EXIF가 없는 PNG/BMP 등을 읽을 때마다 exifread가 남기는 경고를 숨김
+logging.getLogger("exifread").setLevel(logging.ERROR)
+
+# 프레임 큐의 끝을 알리는 표식
+_FRAME_QUEUE_END = object()
+
+# 단계 사이 프레임 큐 크기 (메모리 사용량 제한)
+_STAGE_QUEUE_SIZE = 4
+
+# 촬영 날짜 EXIF 태그 (우선순위 순)
+# DateTimeOriginal이 없을 때만 EXIF 블록을 끝까지 읽으므로 DateTimeDigitized도 그때 채워짐
+_EXIF_DATE_TAGS = ("EXIF DateTimeOriginal", "EXIF DateTimeDigitized", "Image DateTime")
+
+# 비디오 긴 변/짧은 변의 최대 길이 (가로세로 비율은 가장 많은 사진의 비율을 따름)
+_VIDEO_LONG_SIDE = 1920
+_VIDEO_SHORT_SIDE = 1080
+
+# 가로/세로가 바뀌는 EXIF 방향 값 (90도 회전 또는 대각선 반전)
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+# 축소 배율별 디코딩 방법 - cv2 상수 이름 (JPEG은 DCT 단계에서 바로 축소되어 훨씬 빠름)
+# cv2를 비디오 생성 시에만 불러오기 위해 값 대신 이름으로 보관
+_REDUCED_DECODE_FLAGS = {
+    1: "IMREAD_COLOR",
+    2: "IMREAD_REDUCED_COLOR_2",
+    4: "IMREAD_REDUCED_COLOR_4",
+}
+
+# ZIP으로 압축했을 때 크기가 줄어드는 무압축 이미지 형식
+_UNCOMPRESSED_IMAGE_EXTENSIONS = {'.bmp', '.tiff', '.tif'}
+
+def get_image_date(fh_or_bytes):
     """
-    이미지 파일에서 촬영 날짜를 추출하는 함수
-    EXIF 데이터에서 날짜를 먼저 시도하고, 없으면 파일 생성 날짜 사용
+    이미지(바이트 또는 파일 객체)에서 촬영 날짜와 EXIF 방향 값을 추출하는 함수
+    EXIF 데이터에서 날짜를 먼저 시도하고, 없으면 현재 시각 사용
+    방향 값이 없으면 1(회전 없음)을 반환
     """
+    if isinstance(fh_or_bytes, (bytes, bytearray, memoryview)):
+        fh_or_bytes = io.BytesIO(fh_or_bytes)
+    
+    image_date = None
+    orientation = 1
+    
     try:
-        # EXIF 데이터에서 날짜 추출 시도
-        image = Image.open(image_path)
-        exifdata = image.getexif()
+        # EXIF 데이터에서 날짜 추출 시도 (날짜 태그까지만 읽고 중단)
+        tags = exifread.process_file(
+            fh_or_bytes,
+            stop_tag="EXIF DateTimeOriginal",
+            details=False,
+            extract_thumbnail=False
+        )
+        # 방향 태그는 날짜 태그보다 앞(IFD0)에 있어 같은 파싱에서 함께 읽힘
+        orientation_tag = tags.get("Image Orientation")
+        if orientation_tag:
+            orientation = int(orientation_tag.values[0])
         
-        for tag_id in exifdata:
-            tag = TAGS.get(tag_id, tag_id)
-            data = exifdata.get(tag_id)
-            
-            if tag == "DateTime":
-                return datetime.strptime(data, "%Y:%m:%d %H:%M:%S")
-            elif tag == "DateTimeOriginal":
-                return datetime.strptime(data, "%Y:%m:%d %H:%M:%S")
-            elif tag == "DateTimeDigitized":
-                return datetime.strptime(data, "%Y:%m:%d %H:%M:%S")
+        # 우선순위대로 날짜 태그를 직접 찾고 처음 읽히는 값에서 멈춤
+        for tag_name in _EXIF_DATE_TAGS:
+            tag = tags.get(tag_name)
+            if not tag:
+                continue
+            try:
+                image_date = datetime.strptime(str(tag), "%Y:%m:%d %H:%M:%S")
+                break
+            except ValueError:
+                continue
     except Exception as e:
         pass
     
-    # EXIF 데이터가 없으면 파일 생성 날짜 사용
-    try:
-        timestamp = os.path.getctime(image_path)
-        return datetime.fromtimestamp(timestamp)
-    except Exception:
-        return datetime.now()
+    # EXIF 데이터가 없으면 현재 시각 사용 (업로드 파일에는 생성 날짜가 없음)
+    if image_date is None:
+        image_date = datetime.now()
+    
+    return image_date, orientation
+
+def extract_dates(files_bytes):
+    """
+    여러 이미지의 (촬영 날짜, EXIF 방향) 목록을 한 번에 추출하는 함수
+    날짜 태그까지만 읽으므로 파일당 비용이 작아 캐시 없이 순서대로 처리함
+    (내용 전체를 해시하는 캐시 키 계산이 파싱보다 훨씬 느림)
+    폴더 정리와 비디오 생성이 이 결과를 함께 사용할 수 있음
+    """
+    return [get_image_date(file_bytes) for file_bytes in files_bytes]
 
 def get_week_range(date):
     """
@@ -57,61 +115,304 @@ def get_week_range(date):
     
     return folder_name, start_of_week, end_of_week
 
-def organize_photos_by_week(uploaded_files, output_dir):
+def _get_image_entries(uploaded_files, dates):
+    """
+    업로드된 파일 중 이미지 파일만 (파일, 바이트, 촬영 날짜, EXIF 방향)으로 묶는 함수
+    dates가 없으면 여기서 추출함 (uploaded_files와 같은 순서의 extract_dates 결과)
+    """
+    files_bytes = tuple(f.getvalue() for f in uploaded_files)
+    if dates is None:
+        dates = extract_dates(files_bytes)
+    
+    return [
+        (uploaded_file, file_bytes, image_date, orientation)
+        for uploaded_file, file_bytes, (image_date, orientation) in zip(uploaded_files, files_bytes, dates)
+        if uploaded_file.type.startswith('image/')
+    ]
+
+def _unique_file_name(file_name, used_names):
+    """
+    used_names에 없는 파일명을 만드는 함수 (겹치면 "이름 (2).jpg" 형식으로 번호를 붙임)
+    """
+    stem, ext = os.path.splitext(file_name)
+    unique_name = file_name
+    counter = 2
+    while unique_name in used_names:
+        unique_name = f"{stem} ({counter}){ext}"
+        counter += 1
+    used_names.add(unique_name)
+    return unique_name
+
+def organize_photos_by_week(uploaded_files, output_dir=None, dates=None):
     """
     업로드된 사진들을 주차별로 정리하는 함수
+    {주차 폴더명: [(파일명, 바이트), ...]}를 반환하며, output_dir을 주면 디스크에도 저장
+    dates에 extract_dates 결과를 넘기면 EXIF를 다시 읽지 않음
     """
-    result_folders = {}
+    # 주차별 폴더로 분류
+    result_folders = defaultdict(list)
+    used_names = defaultdict(set)
+    for uploaded_file, file_bytes, image_date, _ in _get_image_entries(uploaded_files, dates):
+        folder_name, start_date, end_date = get_week_range(image_date)
+        # 여러 휴대폰에서 온 같은 이름의 사진이 서로 덮어쓰지 않도록 폴더 안에서 이름을 구분
+        name = _unique_file_name(uploaded_file.name, used_names[folder_name])
+        result_folders[folder_name].append((name, file_bytes))
     
-    # 각 이미지 파일 처리
-    for uploaded_file in uploaded_files:
-        if uploaded_file.type.startswith('image/'):
-            # 임시 파일로 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_path = tmp_file.name
-            
-            # 이미지 날짜 추출
-            image_date = get_image_date(tmp_path)
-            folder_name, start_date, end_date = get_week_range(image_date)
-            
-            # 폴더 경로 생성
+    if output_dir is not None:
+        for folder_name, files in result_folders.items():
+            # 폴더 경로 생성 (폴더마다 한 번씩만)
             folder_path = os.path.join(output_dir, folder_name)
             os.makedirs(folder_path, exist_ok=True)
             
-            # 파일 복사
-            dest_path = os.path.join(folder_path, uploaded_file.name)
-            shutil.copy2(tmp_path, dest_path)
-            
-            # 결과 기록
-            if folder_name not in result_folders:
-                result_folders[folder_name] = []
-            result_folders[folder_name].append(uploaded_file.name)
-            
-            # 임시 파일 삭제
-            os.unlink(tmp_path)
+            # 파일 저장
+            for name, file_bytes in files:
+                dest_path = os.path.join(folder_path, name)
+                with open(dest_path, "wb") as dest_file:
+                    dest_file.write(file_bytes)
+    
+    return dict(result_folders)
+
+def _decode_image(file_bytes, reduce_factor=1):
+    """
+    메모리의 이미지 바이트를 OpenCV 이미지(BGR)로 디코딩하는 함수
+    reduce_factor가 2나 4이면 JPEG 축소 디코딩으로 1/2, 1/4 크기로 바로 읽음
+    EXIF 방향(회전/반전 8가지 모두)은 OpenCV가 디코딩하면서 적용함
+    """
+    import cv2
+    import numpy as np
+    
+    decode_flag = getattr(cv2, _REDUCED_DECODE_FLAGS[reduce_factor])
+    return cv2.imdecode(np.frombuffer(file_bytes, np.uint8), decode_flag)
+
+def _get_image_size(file_bytes, orientation):
+    """
+    픽셀을 디코딩하지 않고 헤더만 읽어 EXIF 방향을 반영한 (가로, 세로)를 반환하는 함수
+    """
+    try:
+        with Image.open(io.BytesIO(file_bytes)) as image:
+            width, height = image.size
+    except Exception:
+        return None
+    
+    # 90도 회전하거나 대각선으로 반전하는 방향이면 가로/세로가 바뀜
+    if orientation in _TRANSPOSED_ORIENTATIONS:
+        width, height = height, width
+    return width, height
+
+def _round_even(value):
+    """
+    yuv420p 인코딩을 위해 가장 가까운 짝수(최소 2)로 맞추는 함수
+    """
+    return max(2, int(round(value / 2)) * 2)
+
+def _choose_video_size(image_sizes):
+    """
+    가장 많은 이미지의 가로세로 비율에 맞춰 비디오 크기를 고르는 함수
+    긴 변은 _VIDEO_LONG_SIDE, 짧은 변은 _VIDEO_SHORT_SIDE를 넘지 않으며, 작은 사진은 확대하지 않음
+    """
+    if not image_sizes:
+        return None
     
-    return result_folders
+    # 비율별로 묶어 가장 많은 묶음에서 가장 큰 사진을 기준으로 삼음
+    # (앞쪽에 작게 압축된 사진이 있어도 전체 영상이 작아지지 않도록)
+    ratio_counts = Counter(round(width / height, 2) for width, height in image_sizes)
+    common_ratio = ratio_counts.most_common(1)[0][0]
+    width, height = max(
+        (size for size in image_sizes if round(size[0] / size[1], 2) == common_ratio),
+        key=lambda size: size[0] * size[1]
+    )
+    
+    # 하드웨어 인코더가 지원하는 크기를 넘지 않도록 두 변 모두 제한
+    long_side, short_side = max(width, height), min(width, height)
+    scale = min(1.0, _VIDEO_LONG_SIDE / long_side, _VIDEO_SHORT_SIDE / short_side)
+    return _round_even(width * scale), _round_even(height * scale)
 
-def create_slideshow_video(uploaded_files, output_dir):
+def _get_reduce_factor(image_size, video_size):
+    """
+    축소 디코딩 후에도 비디오 크기 이상이 되는 가장 큰 축소 배율(1, 2, 4)을 고르는 함수
+    """
+    if image_size is None:
+        return 1
+    
+    src_width, src_height = image_size
+    width, height = video_size
+    for reduce_factor in (4, 2):
+        if src_width >= reduce_factor * width and src_height >= reduce_factor * height:
+            return reduce_factor
+    return 1
+
+def _decode_stage(sorted_images, out_queue, errors):
+    """
+    1단계: 스레드 풀로 이미지를 병렬 디코딩하여 순서대로 큐에 넣는 함수
+    cv2 디코딩은 GIL을 해제하므로 스레드만으로도 여러 코어를 사용함
+    """
+    max_workers = os.cpu_count() or 1
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for file_bytes, reduce_factor in sorted_images:
+                pending.append(executor.submit(_decode_image, file_bytes, reduce_factor))
+                # 작업자 수만큼만 앞서 디코딩하여 메모리 사용량 제한
+                if len(pending) >= max_workers:
+                    out_queue.put(pending.popleft().result())
+            while pending:
+                out_queue.put(pending.popleft().result())
+    except Exception as e:
+        errors.append(e)
+    finally:
+        out_queue.put(_FRAME_QUEUE_END)
+
+def _resize_stage(in_queue, out_queue, free_buffers, width, height, errors):
+    """
+    2단계: 디코딩된 프레임을 비디오 크기로 조정하는 함수
+    크기 조정 결과는 미리 할당한 버퍼에 써서 프레임마다 새 배열을 만들지 않음
+    비율이 다른 프레임은 늘이지 않고 비율을 유지한 채 가운데에 두고 여백을 검게 채움
+    """
+    import cv2
+    
+    frame = in_queue.get()
+    try:
+        while frame is not _FRAME_QUEUE_END:
+            if frame is not None:
+                if frame.shape[:2] == (height, width):
+                    # 이미 비디오 크기이면 그대로 전달
+                    out_queue.put((frame, False))
+                else:
+                    dst_buf = free_buffers.get()
+                    src_height, src_width = frame.shape[:2]
+                    scale = min(width / src_width, height / src_height)
+                    fit_width = min(width, max(1, int(round(src_width * scale))))
+                    fit_height = min(height, max(1, int(round(src_height * scale))))
+                    
+                    if (fit_width, fit_height) == (width, height):
+                        cv2.resize(frame, (width, height), dst=dst_buf, interpolation=cv2.INTER_AREA)
+                    else:
+                        # 레터박스: 여백을 지우고 비율을 유지한 프레임을 가운데에 배치
+                        dst_buf.fill(0)
+                        x = (width - fit_width) // 2
+                        y = (height - fit_height) // 2
+                        dst_buf[y:y + fit_height, x:x + fit_width] = cv2.resize(
+                            frame, (fit_width, fit_height), interpolation=cv2.INTER_AREA
+                        )
+                    out_queue.put((dst_buf, True))
+            frame = in_queue.get()
+    except Exception as e:
+        errors.append(e)
+        # 앞 단계가 막히지 않도록 남은 프레임을 비움
+        while frame is not _FRAME_QUEUE_END:
+            frame = in_queue.get()
+    finally:
+        out_queue.put(_FRAME_QUEUE_END)
+
+def _write_stage(in_queue, stdin, free_buffers, progress, errors):
+    """
+    3단계: 완성된 프레임을 ffmpeg stdin으로 보내는 함수
+    다 쓴 버퍼는 2단계에서 다시 쓰도록 돌려줌
+    """
+    item = in_queue.get()
+    try:
+        while item is not _FRAME_QUEUE_END:
+            frame, pooled = item
+            stdin.write(frame)
+            progress["processed_count"] += 1
+            if pooled:
+                free_buffers.put(frame)
+            item = in_queue.get()
+    except Exception as e:
+        # ffmpeg가 먼저 종료된 경우(BrokenPipeError)는 ffmpeg 오류 메시지로 알리므로 기록하지 않음
+        if not isinstance(e, BrokenPipeError):
+            errors.append(e)
+        # 앞 단계가 막히지 않도록 남은 프레임을 비우고 버퍼를 돌려줌
+        while item is not _FRAME_QUEUE_END:
+            frame, pooled = item
+            if pooled:
+                free_buffers.put(frame)
+            item = in_queue.get()
+
+def _can_open_encoder(encoder):
+    """
+    ffmpeg로 작은 프레임 하나를 실제로 인코딩해 보아 인코더를 쓸 수 있는지 확인하는 함수
+    (ffmpeg 빌드에 포함되어 있어도 GPU나 드라이버가 없으면 열리지 않음)
+    """
+    try:
+        subprocess.run(
+            [
+                "ffmpeg", "-hide_banner", "-loglevel", "error",
+                "-f", "lavfi", "-i", "color=c=black:s=256x256",
+                "-frames:v", "1",
+                "-c:v", encoder,
+                "-pix_fmt", "yuv420p",
+                "-f", "null", "-",
+            ],
+            capture_output=True,
+            check=True,
+            timeout=30
+        )
+        return True
+    except Exception:
+        return False
+
+@functools.lru_cache(maxsize=None)
+def _get_h264_encoder_args():
+    """
+    사용 가능한 H.264 인코더 옵션을 고르는 함수 (처음 한 번만 ffmpeg에 확인)
+    macOS는 VideoToolbox, NVIDIA GPU가 있으면 NVENC를 쓰되,
+    실제로 열리지 않으면 libx264 사용
+    """
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        encoders = result.stdout
+    except Exception:
+        encoders = ""
+    
+    hardware_encoders = []
+    if platform.system() == "Darwin":
+        hardware_encoders.append("h264_videotoolbox")
+    if os.environ.get("NVIDIA_VISIBLE_DEVICES"):
+        hardware_encoders.append("h264_nvenc")
+    
+    for encoder in hardware_encoders:
+        if encoder in encoders and _can_open_encoder(encoder):
+            return ("-c:v", encoder)
+    return ("-c:v", "libx264", "-preset", "veryfast", "-crf", "23")
+
+def _start_ffmpeg(video_path, width, height, fps):
+    """
+    원본 BGR 프레임을 stdin으로 받아 인코딩하는 ffmpeg 프로세스를 시작하는 함수
+    """
+    command = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "rawvideo",
+        "-pix_fmt", "bgr24",
+        "-s", f"{width}x{height}",
+        "-r", str(fps),
+        "-i", "pipe:0",
+        *_get_h264_encoder_args(),
+        "-pix_fmt", "yuv420p",
+        # 다운로드 전에 브라우저에서 바로 재생되도록 메타데이터를 앞쪽에 배치
+        "-movflags", "+faststart",
+        video_path,
+    ]
+    return subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+def create_slideshow_video(uploaded_files, output_dir, dates=None):
     """
     업로드된 사진들로 슬라이드쇼 비디오를 생성하는 함수
+    dates에 extract_dates 결과를 넘기면 EXIF를 다시 읽지 않음
     """
-    # 이미지 파일들을 날짜순으로 정렬
-    image_files_with_dates = []
-    temp_files = []
-    
-    for uploaded_file in uploaded_files:
-        if uploaded_file.type.startswith('image/'):
-            # 임시 파일로 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_path = tmp_file.name
-                temp_files.append(tmp_path)
-            
-            # 이미지 날짜 추출
-            image_date = get_image_date(tmp_path)
-            image_files_with_dates.append((tmp_path, image_date, uploaded_file.name))
+    # numpy는 비디오를 만들 때만 불러옴 (OpenCV는 각 도우미 함수에서 불러옴)
+    import numpy as np
+    
+    # 이미지 파일들을 날짜순으로 정렬 (임시 파일 없이 메모리에서 처리)
+    image_files_with_dates = [
+        (file_bytes, image_date, uploaded_file.name, orientation)
+        for uploaded_file, file_bytes, image_date, orientation in _get_image_entries(uploaded_files, dates)
+    ]
     
     # 날짜순으로 정렬
     image_files_with_dates.sort(key=lambda x: x[1])
@@ -133,46 +434,76 @@ def create_slideshow_video(uploaded_files, output_dir):
         end_str = last_date.strftime("%m-%d")
         folder_name = f"{first_date.year % 100:02d}({start_str} ~ {end_str})"
     
-    video_filename = f"{folder_name}.mov"
+    video_filename = f"{folder_name}.mp4"
     video_path = os.path.join(output_dir, video_filename)
     
     try:
-        # 첫 번째 이미지로 비디오 크기 결정
-        first_image = cv2.imread(image_files_with_dates[0][0])
-        if first_image is None:
-            return None, "첫 번째 이미지를 읽을 수 없습니다."
-            
-        height, width, layers = first_image.shape
+        # 헤더만 읽어 가장 많은 가로세로 비율로 비디오 크기 결정
+        image_sizes = [
+            _get_image_size(file_bytes, orientation)
+            for file_bytes, _, _, orientation in image_files_with_dates
+        ]
+        video_size = _choose_video_size([size for size in image_sizes if size is not None])
+        if video_size is None:
+            return None, "이미지를 읽을 수 없습니다."
+        
+        width, height = video_size
         
-        # 비디오 코덱 설정 (MOV 파일용) - 더 호환성 높은 코덱 사용
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
         fps = 0.5  # 2초당 1프레임 (한 장당 2초)
         
-        # 비디오 라이터 생성
-        video_writer = cv2.VideoWriter(video_path, fourcc, fps, (width, height))
+        # ffmpeg 프로세스 생성 (stdin으로 원본 프레임 전달)
+        process = _start_ffmpeg(video_path, width, height, fps)
         
-        if not video_writer.isOpened():
-            return None, "비디오 라이터를 초기화할 수 없습니다."
+        # 디코딩 / 크기 조정 / 인코딩(ffmpeg 쓰기) 3단계를 겹쳐서 실행
+        decoded_queue = queue.Queue(maxsize=_STAGE_QUEUE_SIZE)
+        resized_queue = queue.Queue(maxsize=_STAGE_QUEUE_SIZE)
+        errors = []
+        progress = {"processed_count": 0}
         
-        # 각 이미지를 비디오에 추가
-        processed_count = 0
-        for img_path, _, _ in image_files_with_dates:
-            img = cv2.imread(img_path)
-            if img is not None:
-                # 크기 조정 (필요한 경우)
-                img_resized = cv2.resize(img, (width, height))
-                video_writer.write(img_resized)
-                processed_count += 1
+        # 크기 조정용 버퍼를 미리 할당해 두고 돌려가며 사용
+        # (큐에 들어 있는 프레임 + 쓰는 중인 프레임 수만큼 필요)
+        free_buffers = queue.Queue()
+        for _ in range(_STAGE_QUEUE_SIZE + 1):
+            free_buffers.put(np.empty((height, width, 3), dtype=np.uint8))
+        sorted_images = [
+            (file_bytes, _get_reduce_factor(image_size, video_size))
+            for (file_bytes, _, _, _), image_size in zip(image_files_with_dates, image_sizes)
+        ]
+        stages = [
+            threading.Thread(
+                target=_decode_stage,
+                args=(sorted_images, decoded_queue, errors),
+                daemon=True
+            ),
+            threading.Thread(
+                target=_resize_stage,
+                args=(decoded_queue, resized_queue, free_buffers, width, height, errors),
+                daemon=True
+            ),
+            threading.Thread(
+                target=_write_stage,
+                args=(resized_queue, process.stdin, free_buffers, progress, errors),
+                daemon=True
+            ),
+        ]
         
-        # 비디오 라이터 안전하게 닫기
-        video_writer.release()
+        try:
+            for stage in stages:
+                stage.start()
+            for stage in stages:
+                stage.join()
+        finally:
+            # 입력을 닫아야 ffmpeg가 인코딩을 마무리함
+            _, stderr = process.communicate()
         
-        # 임시 파일들 삭제
-        for temp_file in temp_files:
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
+        processed_count = progress["processed_count"]
+        
+        # ffmpeg 자체 오류가 원인을 가장 잘 설명하므로 먼저 확인
+        if process.returncode != 0:
+            return None, f"ffmpeg 인코딩에 실패했습니다: {stderr.decode(errors='ignore').strip()}"
+        
+        if errors:
+            raise errors[0]
         
         if processed_count == 0:
             return None, "처리된 이미지가 없습니다."
@@ -184,13 +515,6 @@ def create_slideshow_video(uploaded_files, output_dir):
             return None, "비디오 파일이 제대로 생성되지 않았습니다."
     
     except Exception as e:
-        # 임시 파일들 삭제
-        for temp_file in temp_files:
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
-        
         return None, f"비디오 생성 중 오류가 발생했습니다: {str(e)}"
 
 def get_desktop_path():
@@ -199,30 +523,42 @@ def get_desktop_path():
     """
     return os.path.join(os.path.expanduser("~"), "Desktop")
 
+def _get_compress_type(file_name):
+    """
+    파일 확장자에 맞는 ZIP 압축 방식을 고르는 함수
+    JPEG/PNG는 이미 압축되어 있으므로 그대로 저장하고, 무압축 형식만 압축
+    """
+    if os.path.splitext(file_name)[1].lower() in _UNCOMPRESSED_IMAGE_EXTENSIONS:
+        return zipfile.ZIP_DEFLATED
+    return zipfile.ZIP_STORED
+
 def create_zip_file(folder_path, zip_path):
     """
     폴더를 ZIP 파일로 압축하는 함수
     """
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
         for root, dirs, files in os.walk(folder_path):
             for file in files:
                 file_path = os.path.join(root, file)
                 arcname = os.path.relpath(file_path, folder_path)
-                zipf.write(file_path, arcname)
+                zipf.write(file_path, arcname, compress_type=_get_compress_type(file))
 
-def create_zip_buffer(folder_path):
+def create_zip_buffer(files_by_folder, root_name="유치원_사진_정리"):
     """
-    폴더를 메모리 버퍼에 ZIP으로 압축하는 함수 (클라우드 환경용)
+    폴더별 (파일명, 바이트) 목록을 메모리 버퍼에 ZIP으로 압축하는 함수 (클라우드 환경용)
+    디스크를 거치지 않고 업로드된 바이트를 그대로 압축
     """
     zip_buffer = io.BytesIO()
     
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                file_path = os.path.join(root, file)
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zipf:
+        for folder_name, files in files_by_folder.items():
+            used_names = set()
+            for file_name, file_bytes in files:
+                # 같은 폴더에 같은 이름이 있으면 ZIP 항목이 겹치지 않도록 번호를 붙임
+                file_name = _unique_file_name(file_name, used_names)
                 # 상대 경로 생성 (유치원_사진_정리 폴더를 포함하도록)
-                arcname = os.path.relpath(file_path, os.path.dirname(folder_path))
-                zipf.write(file_path, arcname)
+                arcname = f"{root_name}/{folder_name}/{file_name}"
+                zipf.writestr(arcname, file_bytes, compress_type=_get_compress_type(file_name))
     
     zip_buffer.seek(0)
-    return zip_buffer 
\ No newline at end of file
+    return zip_buffer